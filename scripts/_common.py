@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the automation scripts
+"""
+
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import yaml
+
+# Optional: orjson encodes/decodes several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml C bindings when available - much faster than the
+# pure-Python SafeLoader, with identical semantics
+_Loader = yaml.CSafeLoader if hasattr(yaml, 'CSafeLoader') else yaml.SafeLoader
+
+logger = logging.getLogger(__name__)
+
+def load_json(path):
+    """Read a JSON file, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def dump_json(data, path):
+    """Write data as JSON, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+# The one queue listener shared by every script in the process
+_log_listener = None
+
+def setup_logging(logfile):
+    """Configure queue-based logging to the given file plus the console.
+
+    Worker threads only enqueue records; a single background listener
+    thread does the actual disk and console writes, so logging never
+    serializes the parallel fanout on the FileHandler lock. A second
+    call (e.g. the combined runner importing several scripts) attaches
+    its log file to the existing listener.
+    """
+    global _log_listener
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(logfile)
+    file_handler.setFormatter(formatter)
+
+    if _log_listener is not None:
+        _log_listener.handlers = _log_listener.handlers + (file_handler,)
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=False)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+def normalize_inventory(inventory):
+    """Fill in per-router defaults once, at load time.
+
+    Resolving the port default here means the per-router hot paths can
+    index the dict directly instead of calling .get() on every use.
+    """
+    for router in inventory.get('routers', []):
+        router.setdefault('port', 22)
+    return inventory
+
+@functools.lru_cache(maxsize=None)
+def load_yaml(path):
+    """Load a YAML file, keeping a JSON sidecar cache keyed on mtime.
+
+    JSON parsing is much faster than YAML, and the config files rarely
+    change between runs. The cache is rebuilt automatically whenever the
+    YAML source is newer than the sidecar. Results are also memoized in-
+    process, so a combined run parses each file at most once.
+    """
+    cache_path = path + '.json.cache'
+
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return load_json(cache_path)
+    except (OSError, ValueError):
+        # Missing or corrupt cache - fall through to the YAML source
+        pass
+
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=_Loader)
+
+    try:
+        dump_json(data, cache_path)
+    except OSError:
+        # Cache is best-effort; a read-only filesystem is not an error
+        pass
+
+    return data
+
+def load_config_files(config_path):
+    """Load the shared inventory plus one task configuration file.
+
+    Replaces the load_config_files copies that each configure_* script
+    used to carry; load_yaml's memoization means the inventory is
+    parsed once no matter how many scripts run in the same process.
+    """
+    try:
+        inventory = normalize_inventory(load_yaml('configs/inventory.yml'))
+        config = load_yaml(config_path)
+        return inventory, config
+    except FileNotFoundError as e:
+        logger.error(f"Configuration file not found: {e}")
+        sys.exit(1)
+    except yaml.YAMLError as e:
+        logger.error(f"Error parsing YAML: {e}")
+        sys.exit(1)
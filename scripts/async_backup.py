@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Asyncio Backup of Router Configurations via scrapli
+Event-loop alternative to backup_configs.py for large inventories
+
+One event-loop thread multiplexes every session, so this scales past
+the point where one thread per router stops being reasonable. Requires
+the optional scrapli + asyncssh dependencies (see requirements.txt).
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+import logging
+from colorama import init, Fore, Style
+
+try:
+    from scrapli.driver.core import AsyncIOSXEDriver
+except ImportError:
+    AsyncIOSXEDriver = None
+
+import backup_configs
+from _common import load_yaml, normalize_inventory
+
+# Initialize colorama
+init(autoreset=True)
+
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Cap concurrent sessions so huge inventories don't exhaust sockets
+MAX_CONCURRENT_SESSIONS = 100
+
+def scrapli_params(router, username, password, secret):
+    """Map an inventory entry onto scrapli connection parameters"""
+    transport = 'asynctelnet' if 'telnet' in router['device_type'] else 'asyncssh'
+
+    return {
+        'host': router['ip'],
+        'port': router['port'],
+        'auth_username': username,
+        'auth_password': password,
+        'auth_secondary': secret,
+        'auth_strict_key': False,
+        'transport': transport,
+        'timeout_socket': 10,
+    }
+
+async def backup_router(router, conn_params, backup_dir, semaphore):
+    """Backup one router's running configuration over an async session"""
+    async with semaphore:
+        try:
+            logger.info(f"Connecting to {router['name']} ({router['ip']})...")
+            async with AsyncIOSXEDriver(**conn_params) as conn:
+                response = await conn.send_command("show running-config")
+                running_config = response.result
+
+            # File I/O runs on the default executor so it never blocks the loop
+            filename, filepath, unchanged = await asyncio.to_thread(
+                backup_configs.write_backup_files, router, running_config, backup_dir)
+
+            file_size = os.path.getsize(filepath)
+            status = 'unchanged' if unchanged else f'{file_size} bytes'
+            print(f"{Fore.GREEN}✓ {router['name']}: {filename} ({status}){Style.RESET_ALL}")
+            logger.info(f"Successfully backed up {router['name']} to {filename}")
+            return True, filename
+
+        except Exception as e:
+            logger.error(f"Error backing up {router['name']}: {e}")
+            print(f"{Fore.RED}✗ Failed to backup {router['name']}: {e}{Style.RESET_ALL}")
+            return False, None
+
+async def backup_all(routers, username, password, secret, backup_dir):
+    """Fan every router out on the event loop and gather the results"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SESSIONS)
+    tasks = [
+        backup_router(router, scrapli_params(router, username, password, secret),
+                      backup_dir, semaphore)
+        for router in routers
+    ]
+    return await asyncio.gather(*tasks)
+
+def main():
+    """Main execution function"""
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"  Configuration Backup Script (asyncio)")
+    print(f"{'='*60}{Style.RESET_ALL}\n")
+
+    if AsyncIOSXEDriver is None:
+        logger.error("scrapli is not installed - run: pip install scrapli asyncssh")
+        sys.exit(1)
+
+    # Load credentials
+    username = os.getenv('ROUTER_USERNAME')
+    password = os.getenv('ROUTER_PASSWORD')
+    secret = os.getenv('ROUTER_SECRET')
+
+    if not all([username, password, secret]):
+        logger.error("Missing credentials. Please check .env file")
+        sys.exit(1)
+
+    # Create backup directory if it doesn't exist
+    backup_dir = Path('backups')
+    backup_dir.mkdir(exist_ok=True)
+
+    # Load inventory
+    inventory = normalize_inventory(load_yaml('configs/inventory.yml'))
+    routers = inventory['routers']
+
+    results = asyncio.run(backup_all(routers, username, password, secret, backup_dir))
+
+    success_count = 0
+    fail_count = 0
+    successful_backups = []
+    for router, (success, filename) in zip(routers, results):
+        if success:
+            success_count += 1
+            successful_backups.append((router['name'], filename))
+        else:
+            fail_count += 1
+
+    # Create backup index
+    if successful_backups:
+        print(f"\n  Creating backup index... ", end='')
+        backup_configs.create_backup_index(backup_dir, successful_backups)
+        print(f"{OK}")
+
+    # Summary
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"  Summary")
+    print(f"{'='*60}{Style.RESET_ALL}")
+    print(f"  {Fore.GREEN}Successful: {success_count}{Style.RESET_ALL}")
+    print(f"  {Fore.RED}Failed: {fail_count}{Style.RESET_ALL}")
+    print()
+
+    return 0 if fail_count == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,26 +5,46 @@ Task 4: Automate configuration backup to GitHub
 """
 
 import yaml
+import hashlib
 import os
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from netmiko import ConnectHandler
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
+from pathlib import Path
 from colorama import init, Fore, Style
 
+from _common import dump_json, load_yaml, normalize_inventory, setup_logging
+
+# Optional: compress historical backups (router configs shrink ~4-8x)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Initialize colorama
 init(autoreset=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('backup.log'),
-        logging.StreamHandler()
-    ]
-)
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+# Serialize the remove+link swap of the _latest files
+latest_lock = threading.Lock()
+
+# Configure logging - records are enqueued and written by a background
+# thread so worker threads never block on disk I/O
+setup_logging('backup.log')
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +54,7 @@ load_dotenv()
 def load_inventory():
     """Load inventory configuration file"""
     try:
-        with open('configs/inventory.yml', 'r') as f:
-            inventory = yaml.safe_load(f)
+        inventory = normalize_inventory(load_yaml('configs/inventory.yml'))
         return inventory
     except FileNotFoundError as e:
         logger.error(f"Inventory file not found: {e}")
@@ -44,100 +63,227 @@ def load_inventory():
         logger.error(f"Error parsing YAML: {e}")
         sys.exit(1)
 
-def backup_router_config(router, username, password, secret, backup_dir):
-    """Connect to router and backup running configuration"""
+def fetch_running_config(device):
+    """Fetch the running configuration, preferring SCP over the CLI.
+
+    SCP moves the config as a raw byte stream with no prompt matching,
+    so netmiko does not regex-scan every line of a large config. Telnet
+    sessions (the GNS3 lab default) have no SCP channel and fall back
+    to plain "show running-config".
+    """
+    if 'telnet' not in device.device_type:
+        try:
+            from netmiko import SCPConn
+
+            with tempfile.NamedTemporaryFile(mode='r', suffix='.cfg') as tmp:
+                scp = SCPConn(device)
+                try:
+                    scp.scp_get_file('system:running-config', tmp.name)
+                finally:
+                    scp.close()
+                tmp.seek(0)
+                return tmp.read()
+        except Exception as e:
+            logger.warning(f"SCP transfer failed, falling back to CLI: {e}")
+
+    return device.send_command("show running-config")
+
+def write_backup_files(router, running_config, backup_dir):
+    """Write the timestamped and _latest backup files for one router.
+
+    Returns (filename, filepath, unchanged) where unchanged means the
+    running-config is identical to the previous backup and nothing was
+    written; filename/filepath then point at the existing _latest copy.
+    Shared by the netmiko workers and the asyncio backup runner.
+    """
+    # Create latest backup without timestamp
+    latest_filename = f"{router['name']}_latest.txt"
+    latest_filepath = backup_dir / latest_filename
+
+    # Configs change rarely, so most runs would rewrite identical bytes.
+    # A hash sidecar lets us skip the write (and the git churn) entirely.
+    new_hash = hashlib.blake2b(running_config.encode(), digest_size=16).hexdigest()
+    hash_path = backup_dir / f"{router['name']}_latest.hash"
+    try:
+        with open(hash_path, 'r') as f:
+            old_hash = f.read().strip()
+    except OSError:
+        old_hash = None
+
+    if new_hash == old_hash and latest_filepath.exists():
+        logger.info(f"{router['name']} running-config unchanged, skipping write")
+        return latest_filename, latest_filepath, True
+
+    # Derive device information from the config we already have
+    # instead of spending extra prompt round-trips on the router
+    version_match = re.search(r'^version \S+', running_config, re.MULTILINE)
+    version_info = version_match.group(0) if version_match else 'version unknown'
+
+    # Create backup filename with timestamp; historical copies are
+    # zstd-compressed when the library is available
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{router['name']}_{timestamp}.txt"
+    if zstandard is not None:
+        filename += '.zst'
+    filepath = backup_dir / filename
+
+    # Write header and body straight to the file instead of building a
+    # second config-sized payload string in memory
+    header = (
+        f"! Backup Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"! Router: {router['name']}\n"
+        f"! IP Address: {router['ip']}\n"
+        f"! {version_info}\n"
+        f"!\n"
+        f"! {'-'*70}\n"
+        f"!\n"
+    )
+
+    if zstandard is not None:
+        # Compressed historical copy; the _latest file stays plain
+        # text so it remains grep-able. The body is streamed into the
+        # compressor in bounded slices to keep peak memory flat.
+        cctx = zstandard.ZstdCompressor(level=3)
+        with open(filepath, 'wb') as f:
+            with cctx.stream_writer(f) as compressor:
+                compressor.write(header.encode())
+                for i in range(0, len(running_config), 65536):
+                    compressor.write(running_config[i:i + 65536].encode())
+        with latest_lock:
+            with open(latest_filepath, 'w') as f:
+                f.write(header)
+                f.write(running_config)
+    else:
+        with open(filepath, 'w') as f:
+            f.write(header)
+            f.write(running_config)
+
+        # Point the latest file at the same data via a hardlink
+        # instead of writing the payload a second time
+        with latest_lock:
+            try:
+                os.remove(latest_filepath)
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(filepath, latest_filepath)
+            except OSError:
+                # Hardlinks unavailable (e.g. cross-device) - fall back to a copy
+                shutil.copyfile(filepath, latest_filepath)
+
+    with open(hash_path, 'w') as f:
+        f.write(new_hash)
+
+    return filename, filepath, False
+
+def backup_router_config(router, base_params, backup_dir, device=None):
+    """Backup the running configuration, connecting if no session is given"""
     device_params = {
+        **base_params,
         'device_type': router['device_type'],
         'ip': router['ip'],
-        'username': username,
-        'password': password,
-        'secret': secret,
-        'port': router.get('port', 22),
-        'timeout': 10,
+        'port': router['port'],
     }
 
-    try:
-        logger.info(f"Connecting to {router['name']} ({router['ip']})...")
-        device = ConnectHandler(**device_params)
-        device.enable()
+    # Buffer console output so parallel workers don't interleave lines
+    output_lines = []
 
-        print(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+    # Only tear down connections this function opened itself
+    owns_connection = device is None
 
-        # Get running configuration
-        print(f"  Retrieving running configuration... ", end='')
-        running_config = device.send_command("show running-config")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
-
-        # Get additional information
-        print(f"  Gathering device information... ", end='')
-        version_info = device.send_command("show version | include Version")
-        hostname = device.send_command("show run | include hostname")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
-
-        # Create backup filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{router['name']}_{timestamp}.txt"
-        filepath = os.path.join(backup_dir, filename)
-
-        # Create latest backup without timestamp
-        latest_filename = f"{router['name']}_latest.txt"
-        latest_filepath = os.path.join(backup_dir, latest_filename)
-
-        # Write backup to file
-        print(f"  Writing backup to file... ", end='')
-        with open(filepath, 'w') as f:
-            f.write(f"! Backup Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"! Router: {router['name']}\n")
-            f.write(f"! IP Address: {router['ip']}\n")
-            f.write(f"! {version_info}\n")
-            f.write(f"!\n")
-            f.write(f"! {'-'*70}\n")
-            f.write(f"!\n")
-            f.write(running_config)
+    try:
+        if owns_connection:
+            logger.info(f"Connecting to {router['name']} ({router['ip']})...")
+            device = ConnectHandler(**device_params)
+            device.enable()
+            output_lines.append(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+        else:
+            output_lines.append(f"\n{Fore.GREEN}✓ {router['name']} (reusing session){Style.RESET_ALL}")
 
-        # Also write to latest file
-        with open(latest_filepath, 'w') as f:
-            f.write(f"! Backup Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"! Router: {router['name']}\n")
-            f.write(f"! IP Address: {router['ip']}\n")
-            f.write(f"! {version_info}\n")
-            f.write(f"!\n")
-            f.write(f"! {'-'*70}\n")
-            f.write(f"!\n")
-            f.write(running_config)
+        # Get running configuration
+        running_config = fetch_running_config(device)
+        output_lines.append(f"  Retrieving running configuration... {OK}")
 
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        filename, filepath, unchanged = write_backup_files(router, running_config, backup_dir)
+        if unchanged:
+            output_lines.append(f"  Configuration unchanged, skipping write... {OK}")
+        else:
+            output_lines.append(f"  Writing backup to file... {OK}")
 
-        # Get file size
-        file_size = os.path.getsize(filepath)
-        print(f"  Backup saved: {filename} ({file_size} bytes)")
+            # Get file size
+            file_size = os.path.getsize(filepath)
+            output_lines.append(f"  Backup saved: {filename} ({file_size} bytes)")
 
-        device.disconnect()
+        if owns_connection:
+            device.disconnect()
         logger.info(f"Successfully backed up {router['name']} to {filename}")
+        with print_lock:
+            print('\n'.join(output_lines))
         return True, filename
 
     except Exception as e:
         logger.error(f"Error backing up {router['name']}: {e}")
-        print(f"\n{Fore.RED}✗ Failed to backup {router['name']}: {e}{Style.RESET_ALL}")
+        output_lines.append(f"\n{Fore.RED}✗ Failed to backup {router['name']}: {e}{Style.RESET_ALL}")
+        with print_lock:
+            print('\n'.join(output_lines))
         return False, None
 
 def create_backup_index(backup_dir, successful_backups):
     """Create an index file listing all backups"""
-    index_file = os.path.join(backup_dir, 'README.md')
+    index_file = backup_dir / 'README.md'
+
+    # Assemble the document in memory and write it in one call
+    parts = [
+        "# Router Configuration Backups\n\n",
+        f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        "## Latest Backups\n\n",
+    ]
+
+    for router_name, filename in successful_backups:
+        parts.append(f"- **{router_name}**: [{filename}]({filename})\n")
+
+    parts.append("\n## All Backups\n\n")
+    parts.append("Check the `backups/` directory for historical backups.\n")
+    parts.append("\n## Backup Naming Convention\n\n")
+    parts.append("- Format: `{RouterName}_{YYYYMMDD_HHMMSS}.txt` (`.txt.zst` when compressed)\n")
+    parts.append("- Latest: `{RouterName}_latest.txt`\n")
 
     with open(index_file, 'w') as f:
-        f.write("# Router Configuration Backups\n\n")
-        f.write(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("## Latest Backups\n\n")
+        f.write(''.join(parts))
+
+    # Machine-readable sidecar alongside the markdown index
+    dump_json({
+        'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'backups': [
+            {'router': router_name, 'filename': filename}
+            for router_name, filename in successful_backups
+        ],
+    }, backup_dir / 'index.json')
+
+def push_backups_to_github(backup_dir, success_count):
+    """Commit and push all new backups in a single batch.
+
+    One add/commit/push covers the whole run regardless of router count;
+    committing per router would pay a pack negotiation and network
+    round-trip per device. Enabled with BACKUP_GIT_PUSH=true.
+    """
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        subprocess.run(['git', 'add', '-A', backup_dir], check=True)
 
-        for router_name, filename in successful_backups:
-            f.write(f"- **{router_name}**: [{filename}]({filename})\n")
+        commit = subprocess.run(
+            ['git', 'commit', '-m', f'backup {timestamp}: {success_count} routers'])
+        if commit.returncode != 0:
+            logger.info("No backup changes to commit")
+            return True
 
-        f.write("\n## All Backups\n\n")
-        f.write("Check the `backups/` directory for historical backups.\n")
-        f.write("\n## Backup Naming Convention\n\n")
-        f.write("- Format: `{RouterName}_{YYYYMMDD_HHMMSS}.txt`\n")
-        f.write("- Latest: `{RouterName}_latest.txt`\n")
+        subprocess.run(['git', 'push'], check=True)
+        logger.info(f"Pushed backups for {success_count} router(s)")
+        return True
+
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.error(f"Failed to push backups: {e}")
+        return False
 
 def main():
     """Main execution function"""
@@ -154,11 +300,17 @@ def main():
         logger.error("Missing credentials. Please check .env file")
         sys.exit(1)
 
+    # Shared connection parameters - built once, merged per router
+    base_params = {
+        'username': username,
+        'password': password,
+        'secret': secret,
+        'timeout': 10,
+    }
+
     # Create backup directory if it doesn't exist
-    backup_dir = 'backups'
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-        logger.info(f"Created backup directory: {backup_dir}")
+    backup_dir = Path('backups')
+    backup_dir.mkdir(exist_ok=True)
 
     # Load inventory
     inventory = load_inventory()
@@ -167,20 +319,32 @@ def main():
     fail_count = 0
     successful_backups = []
 
-    # Process each router
-    for router in inventory['routers']:
-        success, filename = backup_router_config(router, username, password, secret, backup_dir)
-        if success:
-            success_count += 1
-            successful_backups.append((router['name'], filename))
-        else:
-            fail_count += 1
+    # Back up routers in parallel - the work is dominated by SSH round-trips
+    routers = inventory['routers']
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(routers)))) as executor:
+        futures = {
+            executor.submit(backup_router_config, router, base_params, backup_dir): router
+            for router in routers
+        }
+        for future in as_completed(futures):
+            router = futures[future]
+            success, filename = future.result()
+            if success:
+                success_count += 1
+                successful_backups.append((router['name'], filename))
+            else:
+                fail_count += 1
 
     # Create backup index
     if successful_backups:
         print(f"\n  Creating backup index... ", end='')
         create_backup_index(backup_dir, successful_backups)
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        print(f"{OK}")
+
+    # Push the whole run as one commit when enabled
+    if successful_backups and os.getenv('BACKUP_GIT_PUSH', '').lower() in ('1', 'true', 'yes'):
+        print(f"  Pushing backups to GitHub... ", end='')
+        print(f"{OK}" if push_backups_to_github(backup_dir, success_count) else f"{FAIL}")
 
     # Summary
     print(f"\n{Fore.CYAN}{'='*60}")
@@ -188,7 +352,7 @@ def main():
     print(f"{'='*60}{Style.RESET_ALL}")
     print(f"  {Fore.GREEN}Successful: {success_count}{Style.RESET_ALL}")
     print(f"  {Fore.RED}Failed: {fail_count}{Style.RESET_ALL}")
-    print(f"  Backup location: {os.path.abspath(backup_dir)}")
+    print(f"  Backup location: {backup_dir.resolve()}")
     print()
 
     return 0 if fail_count == 0 else 1
@@ -4,51 +4,38 @@ Configure Interfaces on Cisco IOS Routers
 Task 1: Automate IP address configuration on router interfaces
 """
 
-import yaml
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from netmiko import ConnectHandler
 from dotenv import load_dotenv
 import logging
 from colorama import init, Fore, Style
 
+from _common import load_config_files, setup_logging
+
 # Initialize colorama
 init(autoreset=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('interface_config.log'),
-        logging.StreamHandler()
-    ]
-)
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+# Configure logging - records are enqueued and written by a background
+# thread so worker threads never block on disk I/O
+setup_logging('interface_config.log')
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-def load_config_files():
-    """Load YAML configuration files"""
-    try:
-        with open('configs/inventory.yml', 'r') as f:
-            inventory = yaml.safe_load(f)
-
-        with open('configs/interfaces.yml', 'r') as f:
-            interfaces = yaml.safe_load(f)
-
-        return inventory, interfaces
-    except FileNotFoundError as e:
-        logger.error(f"Configuration file not found: {e}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML: {e}")
-        sys.exit(1)
-
-def configure_interface(device, interface_config):
-    """Configure a single interface"""
+def build_interface_commands(interface_config):
+    """Build the configuration commands for a single interface"""
     commands = []
 
     # Interface configuration commands
@@ -61,55 +48,59 @@ def configure_interface(device, interface_config):
     else:
         commands.append("shutdown")
 
-    try:
-        output = device.send_config_set(commands)
-        return True, output
-    except Exception as e:
-        logger.error(f"Error configuring interface: {e}")
-        return False, str(e)
+    return commands
 
-def connect_and_configure(router, username, password, secret, interface_configs):
-    """Connect to router and configure all interfaces"""
+def connect_and_configure(router, base_params, interface_configs, device=None):
+    """Configure all interfaces, connecting if no session is given"""
     device_params = {
+        **base_params,
         'device_type': router['device_type'],
         'ip': router['ip'],
-        'username': username,
-        'password': password,
-        'secret': secret,
-        'port': router.get('port', 22),
-        'timeout': 10,
+        'port': router['port'],
     }
 
-    try:
-        logger.info(f"Connecting to {router['name']} ({router['ip']})...")
-        device = ConnectHandler(**device_params)
-        device.enable()
+    # Buffer console output so parallel workers don't interleave lines
+    output_lines = []
 
-        print(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+    # Only tear down connections this function opened itself
+    owns_connection = device is None
 
-        # Configure each interface
+    try:
+        if owns_connection:
+            logger.info(f"Connecting to {router['name']} ({router['ip']})...")
+            device = ConnectHandler(**device_params)
+            device.enable()
+            output_lines.append(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+        else:
+            output_lines.append(f"\n{Fore.GREEN}✓ {router['name']} (reusing session){Style.RESET_ALL}")
+
+        # Batch all interfaces into one config session - a single
+        # send_config_set pays the configure-terminal round-trip once
+        all_commands = []
         for interface in interface_configs:
-            print(f"  Configuring {interface['name']}... ", end='')
-            success, output = configure_interface(device, interface)
-
-            if success:
-                print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
-                logger.info(f"Successfully configured {interface['name']} on {router['name']}")
-            else:
-                print(f"{Fore.RED}✗{Style.RESET_ALL}")
-                logger.error(f"Failed to configure {interface['name']} on {router['name']}")
-
-        # Save configuration
-        print(f"  Saving configuration... ", end='')
-        device.send_command("write memory")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
-
-        device.disconnect()
+            all_commands.extend(build_interface_commands(interface))
+
+        names = ', '.join(interface['name'] for interface in interface_configs)
+        device.send_config_set(all_commands, cmd_verify=False)
+        output_lines.append(f"  Configuring {names}... {OK}")
+        logger.info(f"Configured {len(interface_configs)} interface(s) on {router['name']}")
+
+        # Save configuration - write memory has no output worth prompt-
+        # matching, so the timing variant with a fixed wait is cheaper
+        device.send_command_timing("write memory", last_read=2.0)
+        output_lines.append(f"  Saving configuration... {OK}")
+
+        if owns_connection:
+            device.disconnect()
+        with print_lock:
+            print('\n'.join(output_lines))
         return True
 
     except Exception as e:
         logger.error(f"Error connecting to {router['name']}: {e}")
-        print(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        output_lines.append(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        with print_lock:
+            print('\n'.join(output_lines))
         return False
 
 def main():
@@ -127,13 +118,22 @@ def main():
         logger.error("Missing credentials. Please check .env file")
         sys.exit(1)
 
+    # Shared connection parameters - built once, merged per router
+    base_params = {
+        'username': username,
+        'password': password,
+        'secret': secret,
+        'timeout': 10,
+    }
+
     # Load configurations
-    inventory, interface_configs = load_config_files()
+    inventory, interface_configs = load_config_files('configs/interfaces.yml')
 
     success_count = 0
     fail_count = 0
 
-    # Process each router
+    # Collect routers that actually have interface configuration
+    work = []
     for router in inventory['routers']:
         router_name = router['name']
 
@@ -144,10 +144,20 @@ def main():
             logger.warning(f"No interface configuration found for {router_name}")
             continue
 
-        if connect_and_configure(router, username, password, secret, router_interfaces):
-            success_count += 1
-        else:
-            fail_count += 1
+        work.append((router, router_interfaces))
+
+    # Configure routers in parallel - the work is dominated by SSH round-trips
+    if work:
+        with ThreadPoolExecutor(max_workers=min(32, len(work))) as executor:
+            futures = [
+                executor.submit(connect_and_configure, router, base_params, router_interfaces)
+                for router, router_interfaces in work
+            ]
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+                else:
+                    fail_count += 1
 
     # Summary
     print(f"\n{Fore.CYAN}{'='*60}")
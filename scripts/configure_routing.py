@@ -4,49 +4,36 @@ Configure Routing Protocols (OSPF/EIGRP) on Cisco IOS Routers
 Task 2: Automate dynamic routing configuration
 """
 
-import yaml
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from netmiko import ConnectHandler
 from dotenv import load_dotenv
 import logging
 from colorama import init, Fore, Style
 
+from _common import load_config_files, setup_logging
+
 # Initialize colorama
 init(autoreset=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('routing_config.log'),
-        logging.StreamHandler()
-    ]
-)
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+# Configure logging - records are enqueued and written by a background
+# thread so worker threads never block on disk I/O
+setup_logging('routing_config.log')
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-def load_config_files():
-    """Load YAML configuration files"""
-    try:
-        with open('configs/inventory.yml', 'r') as f:
-            inventory = yaml.safe_load(f)
-
-        with open('configs/routing.yml', 'r') as f:
-            routing = yaml.safe_load(f)
-
-        return inventory, routing
-    except FileNotFoundError as e:
-        logger.error(f"Configuration file not found: {e}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML: {e}")
-        sys.exit(1)
-
 def configure_ospf(device, router_name, ospf_config):
     """Configure OSPF on router"""
     commands = []
@@ -95,64 +82,71 @@ def configure_eigrp(device, router_name, eigrp_config):
         logger.error(f"Error configuring EIGRP: {e}")
         return False, str(e)
 
-def connect_and_configure(router, username, password, secret, routing_config):
-    """Connect to router and configure routing"""
+def connect_and_configure(router, base_params, routing_config, device=None):
+    """Configure routing protocols, connecting if no session is given"""
     device_params = {
+        **base_params,
         'device_type': router['device_type'],
         'ip': router['ip'],
-        'username': username,
-        'password': password,
-        'secret': secret,
-        'port': router.get('port', 22),
-        'timeout': 10,
+        'port': router['port'],
     }
 
-    try:
-        logger.info(f"Connecting to {router['name']} ({router['ip']})...")
-        device = ConnectHandler(**device_params)
-        device.enable()
+    # Buffer console output so parallel workers don't interleave lines
+    output_lines = []
+
+    # Only tear down connections this function opened itself
+    owns_connection = device is None
 
-        print(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+    try:
+        if owns_connection:
+            logger.info(f"Connecting to {router['name']} ({router['ip']})...")
+            device = ConnectHandler(**device_params)
+            device.enable()
+            output_lines.append(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+        else:
+            output_lines.append(f"\n{Fore.GREEN}✓ {router['name']} (reusing session){Style.RESET_ALL}")
 
         router_name = router['name']
         success = False
 
         # Configure OSPF if enabled
         if routing_config.get('ospf', {}).get('enabled'):
-            print(f"  Configuring OSPF... ", end='')
             success, output = configure_ospf(device, router_name, routing_config['ospf'])
             if success:
-                print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+                output_lines.append(f"  Configuring OSPF... {OK}")
                 logger.info(f"Successfully configured OSPF on {router_name}")
             else:
-                print(f"{Fore.RED}✗{Style.RESET_ALL}")
+                output_lines.append(f"  Configuring OSPF... {FAIL}")
 
         # Configure EIGRP if enabled
         if routing_config.get('eigrp', {}).get('enabled'):
-            print(f"  Configuring EIGRP... ", end='')
             success, output = configure_eigrp(device, router_name, routing_config['eigrp'])
             if success:
-                print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+                output_lines.append(f"  Configuring EIGRP... {OK}")
                 logger.info(f"Successfully configured EIGRP on {router_name}")
             else:
-                print(f"{Fore.RED}✗{Style.RESET_ALL}")
+                output_lines.append(f"  Configuring EIGRP... {FAIL}")
 
         # Verify routing
-        print(f"  Verifying routing table... ", end='')
         routing_table = device.send_command("show ip route")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        output_lines.append(f"  Verifying routing table... {OK}")
 
-        # Save configuration
-        print(f"  Saving configuration... ", end='')
-        device.send_command("write memory")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        # Save configuration - write memory has no output worth prompt-
+        # matching, so the timing variant with a fixed wait is cheaper
+        device.send_command_timing("write memory", last_read=2.0)
+        output_lines.append(f"  Saving configuration... {OK}")
 
-        device.disconnect()
+        if owns_connection:
+            device.disconnect()
+        with print_lock:
+            print('\n'.join(output_lines))
         return True
 
     except Exception as e:
         logger.error(f"Error connecting to {router['name']}: {e}")
-        print(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        output_lines.append(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        with print_lock:
+            print('\n'.join(output_lines))
         return False
 
 def main():
@@ -170,8 +164,16 @@ def main():
         logger.error("Missing credentials. Please check .env file")
         sys.exit(1)
 
+    # Shared connection parameters - built once, merged per router
+    base_params = {
+        'username': username,
+        'password': password,
+        'secret': secret,
+        'timeout': 10,
+    }
+
     # Load configurations
-    inventory, routing_config = load_config_files()
+    inventory, routing_config = load_config_files('configs/routing.yml')
 
     # Check if any routing protocol is enabled
     ospf_enabled = routing_config.get('ospf', {}).get('enabled', False)
@@ -187,12 +189,18 @@ def main():
     success_count = 0
     fail_count = 0
 
-    # Process each router
-    for router in inventory['routers']:
-        if connect_and_configure(router, username, password, secret, routing_config):
-            success_count += 1
-        else:
-            fail_count += 1
+    # Configure routers in parallel - the work is dominated by SSH round-trips
+    routers = inventory['routers']
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(routers)))) as executor:
+        futures = [
+            executor.submit(connect_and_configure, router, base_params, routing_config)
+            for router in routers
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                success_count += 1
+            else:
+                fail_count += 1
 
     # Summary
     print(f"\n{Fore.CYAN}{'='*60}")
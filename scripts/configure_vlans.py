@@ -4,51 +4,38 @@ Configure VLANs and Subinterfaces on Cisco IOS Routers
 Task 3: Automate VLAN configuration
 """
 
-import yaml
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from netmiko import ConnectHandler
 from dotenv import load_dotenv
 import logging
 from colorama import init, Fore, Style
 
+from _common import load_config_files, setup_logging
+
 # Initialize colorama
 init(autoreset=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('vlan_config.log'),
-        logging.StreamHandler()
-    ]
-)
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+# Configure logging - records are enqueued and written by a background
+# thread so worker threads never block on disk I/O
+setup_logging('vlan_config.log')
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-def load_config_files():
-    """Load YAML configuration files"""
-    try:
-        with open('configs/inventory.yml', 'r') as f:
-            inventory = yaml.safe_load(f)
-
-        with open('configs/vlans.yml', 'r') as f:
-            vlans = yaml.safe_load(f)
-
-        return inventory, vlans
-    except FileNotFoundError as e:
-        logger.error(f"Configuration file not found: {e}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML: {e}")
-        sys.exit(1)
-
-def configure_subinterface(device, subinterface_config):
-    """Configure a router subinterface for VLAN"""
+def build_subinterface_commands(subinterface_config):
+    """Build the configuration commands for a single subinterface"""
     commands = []
 
     # Subinterface configuration
@@ -58,31 +45,31 @@ def configure_subinterface(device, subinterface_config):
     commands.append(f"description {subinterface_config['description']}")
     commands.append("no shutdown")
 
-    try:
-        output = device.send_config_set(commands)
-        return True, output
-    except Exception as e:
-        logger.error(f"Error configuring subinterface: {e}")
-        return False, str(e)
+    return commands
 
-def connect_and_configure(router, username, password, secret, vlan_config):
-    """Connect to router and configure VLANs"""
+def connect_and_configure(router, base_params, vlan_config, device=None):
+    """Configure VLAN subinterfaces, connecting if no session is given"""
     device_params = {
+        **base_params,
         'device_type': router['device_type'],
         'ip': router['ip'],
-        'username': username,
-        'password': password,
-        'secret': secret,
-        'port': router.get('port', 22),
-        'timeout': 10,
+        'port': router['port'],
     }
 
-    try:
-        logger.info(f"Connecting to {router['name']} ({router['ip']})...")
-        device = ConnectHandler(**device_params)
-        device.enable()
+    # Buffer console output so parallel workers don't interleave lines
+    output_lines = []
+
+    # Only tear down connections this function opened itself
+    owns_connection = device is None
 
-        print(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+    try:
+        if owns_connection:
+            logger.info(f"Connecting to {router['name']} ({router['ip']})...")
+            device = ConnectHandler(**device_params)
+            device.enable()
+            output_lines.append(f"\n{Fore.GREEN}✓ Connected to {router['name']}{Style.RESET_ALL}")
+        else:
+            output_lines.append(f"\n{Fore.GREEN}✓ {router['name']} (reusing session){Style.RESET_ALL}")
 
         router_name = router['name']
 
@@ -90,38 +77,44 @@ def connect_and_configure(router, username, password, secret, vlan_config):
         subinterfaces = vlan_config.get('router_subinterfaces', {}).get(router_name, [])
 
         if not subinterfaces:
-            print(f"  {Fore.YELLOW}No VLAN configuration for this router{Style.RESET_ALL}")
-            device.disconnect()
+            output_lines.append(f"  {Fore.YELLOW}No VLAN configuration for this router{Style.RESET_ALL}")
+            if owns_connection:
+                device.disconnect()
+            with print_lock:
+                print('\n'.join(output_lines))
             return True
 
-        # Configure each subinterface
+        # Batch all subinterfaces into one config session - a single
+        # send_config_set pays the configure-terminal round-trip once
+        all_commands = []
         for subintf in subinterfaces:
-            print(f"  Configuring {subintf['interface']} (VLAN {subintf['vlan']})... ", end='')
-            success, output = configure_subinterface(device, subintf)
+            all_commands.extend(build_subinterface_commands(subintf))
 
-            if success:
-                print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
-                logger.info(f"Successfully configured {subintf['interface']} on {router_name}")
-            else:
-                print(f"{Fore.RED}✗{Style.RESET_ALL}")
-                logger.error(f"Failed to configure {subintf['interface']} on {router_name}")
+        names = ', '.join(f"{subintf['interface']} (VLAN {subintf['vlan']})" for subintf in subinterfaces)
+        device.send_config_set(all_commands, cmd_verify=False)
+        output_lines.append(f"  Configuring {names}... {OK}")
+        logger.info(f"Configured {len(subinterfaces)} subinterface(s) on {router_name}")
 
         # Show VLAN summary
-        print(f"  Verifying subinterfaces... ", end='')
         verification = device.send_command("show ip interface brief | include \\.")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        output_lines.append(f"  Verifying subinterfaces... {OK}")
 
-        # Save configuration
-        print(f"  Saving configuration... ", end='')
-        device.send_command("write memory")
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL}")
+        # Save configuration - write memory has no output worth prompt-
+        # matching, so the timing variant with a fixed wait is cheaper
+        device.send_command_timing("write memory", last_read=2.0)
+        output_lines.append(f"  Saving configuration... {OK}")
 
-        device.disconnect()
+        if owns_connection:
+            device.disconnect()
+        with print_lock:
+            print('\n'.join(output_lines))
         return True
 
     except Exception as e:
         logger.error(f"Error connecting to {router['name']}: {e}")
-        print(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        output_lines.append(f"\n{Fore.RED}✗ Failed to connect to {router['name']}: {e}{Style.RESET_ALL}")
+        with print_lock:
+            print('\n'.join(output_lines))
         return False
 
 def main():
@@ -139,8 +132,16 @@ def main():
         logger.error("Missing credentials. Please check .env file")
         sys.exit(1)
 
+    # Shared connection parameters - built once, merged per router
+    base_params = {
+        'username': username,
+        'password': password,
+        'secret': secret,
+        'timeout': 10,
+    }
+
     # Load configurations
-    inventory, vlan_config = load_config_files()
+    inventory, vlan_config = load_config_files('configs/vlans.yml')
 
     # Display VLAN information
     vlans = vlan_config.get('vlans', [])
@@ -153,12 +154,18 @@ def main():
     success_count = 0
     fail_count = 0
 
-    # Process each router
-    for router in inventory['routers']:
-        if connect_and_configure(router, username, password, secret, vlan_config):
-            success_count += 1
-        else:
-            fail_count += 1
+    # Configure routers in parallel - the work is dominated by SSH round-trips
+    routers = inventory['routers']
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(routers)))) as executor:
+        futures = [
+            executor.submit(connect_and_configure, router, base_params, vlan_config)
+            for router in routers
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                success_count += 1
+            else:
+                fail_count += 1
 
     # Summary
     print(f"\n{Fore.CYAN}{'='*60}")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Run the Full Automation Pipeline on Persistent Sessions
+Interfaces -> Routing -> VLANs -> Backup over one connection per router
+"""
+
+import os
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+import logging
+from colorama import init, Fore, Style
+
+import backup_configs
+import configure_interfaces
+import configure_routing
+import configure_vlans
+from _common import load_config_files
+from session_manager import RouterSession, close_all_sessions
+
+# Initialize colorama
+init(autoreset=True)
+
+# Pre-built status markers - formatted once instead of on every print
+OK = f"{Fore.GREEN}✓{Style.RESET_ALL}"
+FAIL = f"{Fore.RED}✗{Style.RESET_ALL}"
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+def run_router_pipeline(router, base_params,
+                        interface_configs, routing_config, vlan_config, backup_dir):
+    """Run all four tasks for one router over a single persistent session"""
+    results = []
+    backup_filename = None
+
+    try:
+        with RouterSession(router, base_params) as device:
+            router_interfaces = interface_configs.get(router['name'], {}).get('interfaces', [])
+            if router_interfaces:
+                results.append(configure_interfaces.connect_and_configure(
+                    router, base_params, router_interfaces, device=device))
+
+            if routing_config.get('ospf', {}).get('enabled') or \
+                    routing_config.get('eigrp', {}).get('enabled'):
+                results.append(configure_routing.connect_and_configure(
+                    router, base_params, routing_config, device=device))
+
+            results.append(configure_vlans.connect_and_configure(
+                router, base_params, vlan_config, device=device))
+
+            backup_ok, backup_filename = backup_configs.backup_router_config(
+                router, base_params, backup_dir, device=device)
+            results.append(backup_ok)
+
+        return all(results), backup_filename
+
+    except Exception as e:
+        logger.error(f"Pipeline failed for {router['name']}: {e}")
+        print(f"\n{Fore.RED}✗ Pipeline failed for {router['name']}: {e}{Style.RESET_ALL}")
+        return False, None
+
+def main():
+    """Main execution function"""
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"  Full Automation Pipeline")
+    print(f"{'='*60}{Style.RESET_ALL}\n")
+
+    # Load credentials
+    username = os.getenv('ROUTER_USERNAME')
+    password = os.getenv('ROUTER_PASSWORD')
+    secret = os.getenv('ROUTER_SECRET')
+
+    if not all([username, password, secret]):
+        logger.error("Missing credentials. Please check .env file")
+        sys.exit(1)
+
+    # Shared connection parameters - built once, merged per router
+    base_params = {
+        'username': username,
+        'password': password,
+        'secret': secret,
+        'timeout': 10,
+    }
+
+    # Create backup directory if it doesn't exist
+    backup_dir = Path('backups')
+    backup_dir.mkdir(exist_ok=True)
+
+    # Load all configurations once; the inventory is parsed a single
+    # time thanks to load_yaml's memoization
+    inventory, interface_configs = load_config_files('configs/interfaces.yml')
+    _, routing_config = load_config_files('configs/routing.yml')
+    _, vlan_config = load_config_files('configs/vlans.yml')
+
+    success_count = 0
+    fail_count = 0
+    successful_backups = []
+
+    # One persistent session per router, tasks run sequentially on it
+    routers = inventory['routers']
+    try:
+        with ThreadPoolExecutor(max_workers=min(32, max(1, len(routers)))) as executor:
+            futures = {
+                executor.submit(run_router_pipeline, router, base_params,
+                                interface_configs, routing_config, vlan_config, backup_dir): router
+                for router in routers
+            }
+            for future in as_completed(futures):
+                router = futures[future]
+                success, filename = future.result()
+                if success:
+                    success_count += 1
+                else:
+                    fail_count += 1
+                if filename:
+                    successful_backups.append((router['name'], filename))
+    finally:
+        close_all_sessions()
+
+    # Create backup index
+    if successful_backups:
+        print(f"\n  Creating backup index... ", end='')
+        backup_configs.create_backup_index(backup_dir, successful_backups)
+        print(f"{OK}")
+
+    # Summary
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"  Summary")
+    print(f"{'='*60}{Style.RESET_ALL}")
+    print(f"  {Fore.GREEN}Successful: {success_count}{Style.RESET_ALL}")
+    print(f"  {Fore.RED}Failed: {fail_count}{Style.RESET_ALL}")
+    print()
+
+    return 0 if fail_count == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
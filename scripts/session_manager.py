@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Persistent Session Management for Cisco IOS Routers
+Keeps one netmiko connection per router alive across automation tasks
+"""
+
+import logging
+import threading
+import time
+
+from netmiko import ConnectHandler
+
+logger = logging.getLogger(__name__)
+
+# Live connections cached by router name
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Idle sessions get a newline periodically so they survive exec-timeout
+KEEPALIVE_INTERVAL = 30
+_keepalive_thread = None
+
+def _keepalive_loop():
+    """Background loop keeping cached sessions from timing out"""
+    while True:
+        time.sleep(KEEPALIVE_INTERVAL)
+        with _sessions_lock:
+            devices = list(_sessions.values())
+        for device in devices:
+            try:
+                device.write_channel('\n')
+            except Exception:
+                # A dead session is reopened lazily by get_session
+                pass
+
+def _ensure_keepalive():
+    global _keepalive_thread
+    if _keepalive_thread is None:
+        _keepalive_thread = threading.Thread(
+            target=_keepalive_loop, name='session-keepalive', daemon=True
+        )
+        _keepalive_thread.start()
+
+def get_session(router, base_params):
+    """Return a live, enabled connection for the router, opening one if needed"""
+    with _sessions_lock:
+        device = _sessions.get(router['name'])
+
+    if device is not None:
+        try:
+            if device.is_alive():
+                return device
+        except Exception:
+            pass
+        logger.warning(f"Session to {router['name']} went stale, reconnecting...")
+
+    device_params = {
+        **base_params,
+        'device_type': router['device_type'],
+        'ip': router['ip'],
+        'port': router['port'],
+    }
+
+    logger.info(f"Opening session to {router['name']} ({router['ip']})...")
+    device = ConnectHandler(**device_params)
+    device.enable()
+
+    with _sessions_lock:
+        _sessions[router['name']] = device
+    _ensure_keepalive()
+    return device
+
+def close_all_sessions():
+    """Disconnect and forget every cached session"""
+    with _sessions_lock:
+        devices = list(_sessions.items())
+        _sessions.clear()
+
+    for name, device in devices:
+        try:
+            device.disconnect()
+            logger.info(f"Closed session to {name}")
+        except Exception as e:
+            logger.warning(f"Error closing session to {name}: {e}")
+
+class RouterSession:
+    """Context manager yielding a cached, already-enabled connection.
+
+    The connection stays cached on exit so the next task reuses it;
+    call close_all_sessions() once the whole pipeline is finished.
+    """
+
+    def __init__(self, router, base_params):
+        self.router = router
+        self._base_params = base_params
+
+    def __enter__(self):
+        return get_session(self.router, self._base_params)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
@@ -52,9 +52,8 @@ def test_router(router_info):
         
         print(f"✓ Connected to {router_name}!")
         
-        # Get hostname
-        hostname = device.send_command("show run | include hostname")
-        print(f"\n{hostname}")
+        # Hostname is already cached on the connection - no round-trip
+        print(f"\nhostname {device.base_prompt}")
         
         # Get interface status
         print("\nInterface Status:")